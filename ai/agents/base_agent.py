@@ -1,10 +1,124 @@
 """Base class for all agents with JSON response file handling"""
-import json
 import asyncio
+import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
-from openai import OpenAI
+from typing import Dict, Any, Callable, Optional, Tuple
+from openai import AsyncOpenAI
+from agents.utils.json_utils import dumps_pretty, dumps_compact, dumps_line, raw_json, loads
+from agents.utils.llm_cache import llm_cache, CACHEABLE_MAX_TEMPERATURE
+
+
+logger = logging.getLogger(__name__)
+
+# Per-agent request/response debug files (on by default for local debugging)
+ENABLE_DEBUG_FILES = os.getenv("ENABLE_DEBUG_FILES", "true").lower() in ("1", "true", "yes")
+
+# Append each response to the response file as a JSON Lines record instead of
+# rewriting the whole file per call
+DEBUG_APPEND_MODE = os.getenv("AGENT_DEBUG_APPEND_MODE", "false").lower() in ("1", "true", "yes")
+
+# Sent as a second system message when a response schema is requested, so the
+# agent's own system prompt stays an identical (prompt-cacheable) prefix
+_SCHEMA_NOTE_TEMPLATE = (
+    "*** RESPONSE FORMAT REQUIREMENTS ***\n"
+    "You must return valid JSON matching this exact schema structure.\n"
+    "Include ALL required fields shown below.\n\nSchema:\n{schema_json}"
+)
+
+# Rendered schema notes kept per agent; bounded so schemas built per call
+# cannot grow the cache without limit
+SCHEMA_NOTE_CACHE_SIZE = 8
+
+
+def _write_debug_file(path: Path, data: bytes, append: bool = False) -> None:
+    """
+    Synchronously write a debug file (runs in a worker thread)
+    
+    The parent directory is created once in BaseAgent.__init__, so no mkdir
+    is issued per write.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _flush_debug_files(pending: Dict[Path, list]) -> None:
+    """Write one coalesced batch of debug files from a single worker thread"""
+    for path, (data, append) in pending.items():
+        try:
+            _write_debug_file(path, data, append)
+        except OSError as e:
+            logger.debug("Debug file write failed for %s: %s", path, e)
+
+
+class _DebugFileWriter:
+    """
+    Background writer for agent request/response debug files
+    
+    A single background task per event loop owns all disk I/O: writes from
+    every agent are queued, grouped by path, and flushed as one batch from a
+    worker thread once per window, so multi-MB HTML dumps never block the
+    calling coroutine. Writes to the same file within one window are
+    coalesced: a full write replaces anything pending for that file, appends
+    are concatenated onto it.
+    """
+    
+    def __init__(self, flush_interval: float = 0.1):
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def submit(self, path: Path, data: bytes, append: bool = False) -> None:
+        """Queue a write; falls back to an inline write outside an event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _write_debug_file(path, data, append)
+            return
+        
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        self._queue.put_nowait((path, data, append))
+    
+    async def _run(self) -> None:
+        """Drain the queue, coalescing writes per path within each window"""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending: Dict[Path, list] = {}
+            self._coalesce(pending, *await self._queue.get())
+            await asyncio.sleep(self.flush_interval)
+            while not self._queue.empty():
+                self._coalesce(pending, *self._queue.get_nowait())
+            
+            await loop.run_in_executor(None, _flush_debug_files, pending)
+    
+    @staticmethod
+    def _coalesce(pending: Dict[Path, list], path: Path, data: bytes, append: bool) -> None:
+        """Merge one queued write into the pending [data, append] entry for its path"""
+        entry = pending.get(path)
+        if entry is None or not append:
+            pending[path] = [data, append]
+        else:
+            entry[0] += data
+
+
+_debug_writer = _DebugFileWriter()
+
+
+def _noop_debug_write(self, *args, **kwargs) -> None:
+    """Stand-in for the debug-file methods when ENABLE_DEBUG_FILES is off"""
 
 
 class AgentError(Exception):
@@ -17,119 +131,173 @@ class BaseAgent:
     
     def __init__(
         self, 
-        client: OpenAI, 
+        client: AsyncOpenAI, 
         model: str = "gpt-4o", 
         temperature: float = 0.7, 
-        agent_name: str = "Agent"
+        agent_name: str = "Agent",
+        agent_dir: Optional[Path] = None
     ):
         self.client = client
         self.model = model
         self.temperature = temperature
         self.timeout = 180  # 3 minute timeout
         self.agent_name = agent_name
+        # Response schemas are module-level constants, so the rendered schema
+        # note is cached per schema object instead of re-encoded per call.
+        # Entries hold the schema itself so its id cannot be reused by another
+        self._schema_note_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        # Per-agent constant request kwargs, copied and extended per call
+        self._base_kwargs: Dict[str, Any] = {
+            "model": model,
+            "temperature": temperature
+        }
         
-        # Determine agent directory - check if we're in a subdirectory
-        # Get the calling module's path by inspecting stack
-        import inspect
-        frame = inspect.currentframe().f_back
-        caller_file = Path(frame.f_globals.get('__file__', __file__))
-        
-        # If caller is in a subdirectory (e.g., mapper/mapper_agent.py), use that directory
-        if caller_file.parent.name != Path(__file__).parent.name:
-            agent_dir = caller_file.parent
-        else:
-            # Fallback to agent_name directory
-            base_dir = Path(__file__).parent
-            agent_dir = base_dir / agent_name.lower()
+        # Agents pass their own package directory; fall back to agent_name
+        if agent_dir is None:
+            agent_dir = Path(__file__).parent / agent_name.lower()
         
         agent_dir.mkdir(parents=True, exist_ok=True)
         self.response_file = agent_dir / f"{agent_name.lower()}_response.json"
         self.request_file = agent_dir / f"{agent_name.lower()}_request.json"
     
     def _clear_response_file(self):
-        """Clear the response file before each request"""
-        if self.response_file.exists():
-            self.response_file.write_text("{}", encoding="utf-8")
-    
-    def _clear_request_file(self):
-        """Clear the request file before each request"""
-        if self.request_file.exists():
-            self.request_file.write_text("{}", encoding="utf-8")
+        """Clear the response file before each request (kept in append mode)"""
+        if not DEBUG_APPEND_MODE:
+            _debug_writer.submit(self.response_file, b"{}")
     
     def _write_request(self, request_data: Dict[str, Any]):
-        """Write agent request to JSON file"""
-        self.request_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.request_file, "w", encoding="utf-8") as f:
-            json.dump(request_data, f, indent=2, ensure_ascii=False)
+        """Queue agent request for writing to JSON file"""
+        _debug_writer.submit(self.request_file, dumps_pretty(request_data))
     
     def _write_response(self, response: Dict[str, Any]):
-        """Write agent response to JSON file"""
-        self.response_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.response_file, "w", encoding="utf-8") as f:
-            json.dump(response, f, indent=2, ensure_ascii=False)
+        """Queue agent response for writing to JSON file"""
+        if DEBUG_APPEND_MODE:
+            _debug_writer.submit(self.response_file, dumps_line(response), append=True)
+        else:
+            _debug_writer.submit(self.response_file, dumps_pretty(response))
+    
+    if not ENABLE_DEBUG_FILES:
+        # Bind no-ops at class creation so production calls skip the bodies
+        _clear_response_file = _noop_debug_write
+        _write_request = _noop_debug_write
+        _write_response = _noop_debug_write
+    
+    def _get_schema_note(self, response_schema: Dict[str, Any]) -> str:
+        """Return the rendered schema instructions, cached per schema"""
+        key = id(response_schema)
+        entry = self._schema_note_cache.get(key)
+        if entry is not None and entry[0] is response_schema:
+            return entry[1]
+        schema_note = _SCHEMA_NOTE_TEMPLATE.format(
+            schema_json=dumps_pretty(response_schema).decode("utf-8")
+        )
+        if entry is None and len(self._schema_note_cache) >= SCHEMA_NOTE_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._schema_note_cache[next(iter(self._schema_note_cache))]
+        self._schema_note_cache[key] = (response_schema, schema_note)
+        return schema_note
     
     async def _call_openai(
         self,
         system_prompt: str,
         user_message: Dict[str, Any],
-        response_schema: Optional[Dict[str, Any]] = None
+        response_schema: Optional[Dict[str, Any]] = None,
+        user_content: Optional[bytes] = None,
+        cache_eligible: bool = True,
+        cache_accept: Optional[Callable[[Any], bool]] = None,
+        temperature: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Common OpenAI call logic"""
-        # Clear request and response files before each call
-        self._clear_request_file()
+        """
+        Common OpenAI call logic
+        
+        Callers sending the same user_message more than once can pass its
+        dumps_compact() encoding as user_content to skip re-serializing it.
+        
+        Deterministic calls (temperature <= CACHEABLE_MAX_TEMPERATURE) answer a
+        byte-identical earlier request from the exact-match response cache;
+        pass cache_eligible=False to force a fresh call. A fresh response is
+        only stored when cache_accept (if given) approves the parsed result,
+        so rejected responses are never replayed.
+        
+        temperature overrides the agent's sampling temperature for this call.
+        """
+        if temperature is None:
+            temperature = self.temperature
+        
+        # Clear the response file before each call; the request file is
+        # truncated by the request write below, so it needs no separate clear
         self._clear_response_file()
         
+        # Compact on the wire: indentation only adds billed prompt tokens
+        if user_content is None:
+            user_content = dumps_compact(user_message)
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_message, indent=2)}
+            {"role": "user", "content": user_content.decode("utf-8")}
         ]
         
         # Write request to file
-        request_data = {
-            "model": self.model,
-            "temperature": self.temperature,
-            "system_prompt": system_prompt,
-            "user_message": user_message,
-            "has_response_schema": response_schema is not None
-        }
-        self._write_request(request_data)
+        if ENABLE_DEBUG_FILES:
+            self._write_request({
+                "model": self.model,
+                "temperature": temperature,
+                "system_prompt": system_prompt,
+                # Embed the exact wire encoding rather than serializing twice
+                "user_message": raw_json(user_content, user_message),
+                "has_response_schema": response_schema is not None
+            })
         
-        kwargs = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": self.temperature
-        }
+        kwargs = self._base_kwargs.copy()
+        kwargs["temperature"] = temperature
+        kwargs["messages"] = messages
         
-        # Add response format for structured output
+        # Add response format for structured output; the schema note goes
+        # after the static system prompt so that prefix is never modified
         if response_schema:
             kwargs["response_format"] = {"type": "json_object"}
-            schema_json = json.dumps(response_schema, indent=2)
-            schema_note = (
-                f"\n\n*** RESPONSE FORMAT REQUIREMENTS ***\n"
-                f"You must return valid JSON matching this exact schema structure.\n"
-                f"Include ALL required fields shown below.\n\nSchema:\n{schema_json}"
-            )
-            messages[0]["content"] += schema_note
+            messages.insert(1, {"role": "system", "content": self._get_schema_note(response_schema)})
+        
+        # Sampled (higher-temperature) calls are never replayed from cache
+        cache_key = None
+        if cache_eligible and temperature <= CACHEABLE_MAX_TEMPERATURE:
+            cache_key = llm_cache.cache_key(kwargs)
         
         try:
-            print(f"[{self.agent_name}] Calling {self.model}")
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    self.client.chat.completions.create,
-                    **kwargs
-                ),
-                timeout=self.timeout
-            )
-            
-            result_text = response.choices[0].message.content
-            print(f"[{self.agent_name}] Response received ({response.usage.total_tokens} tokens)")
+            result_text = llm_cache.get(cache_key) if cache_key else None
+            cache_hit = result_text is not None
+            if cache_hit:
+                logger.info("[%s] Using cached %s response", self.agent_name, self.model)
+            else:
+                logger.info("[%s] Calling %s", self.agent_name, self.model)
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(**kwargs),
+                    timeout=self.timeout
+                )
+                
+                choice = response.choices[0]
+                result_text = choice.message.content
+                logger.info(
+                    "[%s] Response received (%d tokens)",
+                    self.agent_name, response.usage.total_tokens
+                )
+                
+                # A length stop means the JSON body was cut off - report that
+                # directly instead of surfacing an opaque parse error
+                if response_schema and choice.finish_reason == "length":
+                    raise AgentError(
+                        f"Response truncated at {response.usage.completion_tokens} completion tokens"
+                    )
             
             if response_schema:
-                result = json.loads(result_text)
+                result = loads(result_text)
+                if cache_key and not cache_hit and (cache_accept is None or cache_accept(result)):
+                    llm_cache.set(cache_key, result_text)
                 # Write response to JSON file
                 self._write_response(result)
                 return result
             
+            if cache_key and not cache_hit and (cache_accept is None or cache_accept(result_text)):
+                llm_cache.set(cache_key, result_text)
             # Write response even if no schema
             self._write_response({"response": result_text})
             return result_text
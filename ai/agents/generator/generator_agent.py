@@ -1,18 +1,41 @@
 """Generator agent implementation based on landing-page-agent-with-qa.md"""
 import asyncio
-from typing import Dict, Any
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
 from pydantic import ValidationError
 from agents.base_agent import BaseAgent, AgentError
+from agents.utils.json_utils import dumps_compact
 from agents.generator.generator_prompt import GENERATOR_SYSTEM_PROMPT
 from agents.generator.generator_schemas import GeneratorOutput, GENERATOR_RESPONSE_SCHEMA
 
+# Candidates sampled concurrently on the first attempt. Each one is a full
+# HTML/CSS/JS completion billed on output tokens, so racing is opt-in
+GENERATOR_PARALLEL_CANDIDATES = int(os.getenv("GENERATOR_PARALLEL_CANDIDATES", "1"))
+
+# Each further raced candidate samples this much cooler than the previous one,
+# so the race draws diverse pages rather than near-duplicates
+CANDIDATE_TEMPERATURE_STEP = 0.1
+
 
 class GeneratorAgent(BaseAgent):
     """Generator agent - produces static site files with QA/validation loop"""
     
-    def __init__(self, client, model: str = "gpt-4o", temperature: float = 0.7):
-        super().__init__(client, model, temperature, agent_name="Generator")
+    def __init__(
+        self,
+        client,
+        model: str = "gpt-4o",
+        temperature: float = 0.7,
+        parallel_candidates: int = GENERATOR_PARALLEL_CANDIDATES
+    ):
+        super().__init__(
+            client, model, temperature,
+            agent_name="Generator", agent_dir=Path(__file__).parent
+        )
         self.max_retries = 3
+        # First attempt samples this many candidates concurrently and keeps
+        # the first one that passes QA, instead of waiting on serial retries
+        self.parallel_candidates = parallel_candidates
     
     async def run(
         self,
@@ -45,23 +68,17 @@ class GeneratorAgent(BaseAgent):
             "brand_color_enforcement": brand_color_enforcement
         }
         
+        # Encoded once and shared by every candidate raced below
+        user_content = dumps_compact(user_message)
+        
         try:
-            result = await self._call_openai(
-                system_prompt=GENERATOR_SYSTEM_PROMPT,
-                user_message=user_message,
-                response_schema=GENERATOR_RESPONSE_SCHEMA
-            )
-            
-            # Validate output
-            validated = GeneratorOutput.model_validate(result)
-            output_dict = validated.model_dump()
+            if retry_count == 0 and self.parallel_candidates > 1:
+                output_dict = await self._race_candidates(user_message, user_content)
+            else:
+                output_dict = await self._generate_candidate(user_message, user_content)
             
-            # Check QA report if present
-            qa_report = output_dict.get("qa_report", {})
-            
-            if isinstance(qa_report, dict) and not qa_report.get("passed", True) and retry_count < self.max_retries:
+            if not self._qa_passed(output_dict) and retry_count < self.max_retries:
                 print(f"[Generator] QA checks failed, retrying (attempt {retry_count + 1}/{self.max_retries})")
-                await asyncio.sleep(min(2 ** retry_count, 5))
                 return await self.run(
                     google_data, mapper_data, interactivity_tier, 
                     asset_budget, brand_color_enforcement, retry_count + 1
@@ -72,7 +89,6 @@ class GeneratorAgent(BaseAgent):
         except ValidationError as e:
             print(f"[Generator] Validation error: {e}")
             if retry_count < self.max_retries:
-                await asyncio.sleep(min(2 ** retry_count, 5))
                 return await self.run(
                     google_data, mapper_data, interactivity_tier,
                     asset_budget, brand_color_enforcement, retry_count + 1
@@ -81,6 +97,74 @@ class GeneratorAgent(BaseAgent):
         except Exception as e:
             print(f"[Generator] Error: {e}")
             raise AgentError(f"Generator failed: {e}")
+    
+    async def _generate_candidate(
+        self,
+        user_message: Dict[str, Any],
+        user_content: bytes,
+        temperature: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run a single generator call and validate its output"""
+        result = await self._call_openai(
+            system_prompt=GENERATOR_SYSTEM_PROMPT,
+            user_message=user_message,
+            response_schema=GENERATOR_RESPONSE_SCHEMA,
+            user_content=user_content,
+            temperature=temperature
+        )
+        
+        # Validate output
+        validated = GeneratorOutput.model_validate(result)
+        return validated.model_dump()
+    
+    async def _race_candidates(self, user_message: Dict[str, Any], user_content: bytes) -> Dict[str, Any]:
+        """
+        Generate candidates concurrently and return the first that passes QA
+        
+        Candidate i samples at the agent temperature lowered by i steps.
+        Remaining candidates are cancelled as soon as one passes. If none pass,
+        the first completed candidate is returned so the normal QA retry path
+        applies; if all fail, the last error is re-raised.
+        """
+        pending = {
+            asyncio.create_task(self._generate_candidate(
+                user_message, user_content,
+                temperature=max(0.0, self.temperature - i * CANDIDATE_TEMPERATURE_STEP)
+            ))
+            for i in range(self.parallel_candidates)
+        }
+        fallback = None
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Retrieve every finished task's outcome before returning, so
+                # no failed candidate is left with an unretrieved exception
+                passed = None
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    output_dict = task.result()
+                    if passed is None and self._qa_passed(output_dict):
+                        passed = output_dict
+                    elif fallback is None:
+                        fallback = output_dict
+                if passed is not None:
+                    return passed
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if fallback is not None:
+            return fallback
+        raise error
+    
+    @staticmethod
+    def _qa_passed(output_dict: Dict[str, Any]) -> bool:
+        """Check the generator's self-reported QA result"""
+        qa_report = output_dict.get("qa_report", {})
+        return not (isinstance(qa_report, dict) and not qa_report.get("passed", True))
 
 
 # Export for convenience
@@ -1,9 +1,11 @@
 """Main entry point for new agents service"""
 import os
 import sys
+import asyncio
 import logging
 import httpx
-import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,6 +13,7 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional, Callable
 from dotenv import load_dotenv
 from agents.orchestrator.orchestrator_agent import OrchestratorAgent
+from agents.utils.openai_client import close_clients
 
 # Load .env
 _env_path = Path(__file__).resolve().parent.parent / '.env'
@@ -52,55 +55,80 @@ class BuildRequest(BaseModel):
     stop_after: Optional[str] = None  # "mapper", "generator", or "validator" for testing
 
 
+# One orchestrator (and its agents) for the process lifetime, created on the
+# first build so a missing API key still surfaces as a build error
+_orchestrator: Optional[OrchestratorAgent] = None
+
+
+def _get_orchestrator() -> OrchestratorAgent:
+    """Get or create the process-wide orchestrator"""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = OrchestratorAgent()
+    return _orchestrator
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release long-lived clients and the event worker"""
+    try:
+        await close_clients()
+    except Exception as e:
+        logger.warning(f"Error closing OpenAI clients: {e}")
+    # Drain queued event posts off the loop so shutdown doesn't block it
+    await asyncio.to_thread(_event_executor.shutdown, True)
+    if _event_client is not None:
+        _event_client.close()
+
+
 @app.get("/health")
 async def health():
     """Health check"""
     return {"status": "healthy", "service": "new-agents"}
 
 
-async def _send_event_to_backend(session_id: str, phase: str, detail: str) -> None:
-    """Send event to backend /api/events endpoint"""
+# Progress events are posted from one shared worker thread: a single worker
+# keeps phases in order and the shared client keeps its connection alive
+_event_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-sender")
+_event_client: Optional[httpx.Client] = None
+
+
+def _get_event_client() -> httpx.Client:
+    """Get or create the HTTP client used for backend events"""
+    global _event_client
+    if _event_client is None:
+        _event_client = httpx.Client(timeout=5.0)
+    return _event_client
+
+
+def _send_event_to_backend(session_id: str, phase: str, detail: str) -> None:
+    """Send event to backend /api/events endpoint (runs on the event worker)"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            payload = {
-                "session_id": session_id,
-                "phase": phase,
-                "detail": detail
-            }
-            response = await client.post(
-                f"{BACKEND_URL}/api/events",
-                json=payload
-            )
-            if response.status_code != 200:
-                logger.warning(f"Failed to send event to backend: {response.status_code}")
+        payload = {
+            "session_id": session_id,
+            "phase": phase,
+            "detail": detail
+        }
+        response = _get_event_client().post(
+            f"{BACKEND_URL}/api/events",
+            json=payload
+        )
+        if response.status_code != 200:
+            logger.warning(f"Failed to send event to backend: {response.status_code}")
     except Exception as e:
         # Don't fail the build if event sending fails
-        logger.debug(f"Event sending failed (non-critical): {e}")
+        logger.debug("Event sending failed (non-critical): %s", e)
+
+
+def _emit_event(session_id: str, phase: str, message: str) -> None:
+    """Event callback for progress - logs locally and queues the backend post"""
+    logger.info(f"[{phase}] {message}")
+    _event_executor.submit(_send_event_to_backend, session_id, phase, message)
 
 
 def _create_event_callback(session_id: str) -> Callable[[str, str], None]:
     """Create an event callback that sends events to backend"""
-    def event_callback(phase: str, message: str):
-        """Event callback for progress - sends to backend and logs locally"""
-        logger.info(f"[{phase}] {message}")
-        # Send to backend asynchronously (fire and forget)
-        import threading
-        def run_in_thread():
-            """Run async function in a new thread with its own event loop"""
-            new_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(new_loop)
-            try:
-                new_loop.run_until_complete(_send_event_to_backend(session_id, phase, message))
-            except Exception as e:
-                logger.debug(f"Event sending failed (non-critical): {e}")
-            finally:
-                new_loop.close()
-        
-        # Always run in a separate thread to avoid blocking
-        thread = threading.Thread(target=run_in_thread, daemon=True)
-        thread.start()
-    
-    return event_callback
+    return partial(_emit_event, session_id)
 
 
 @app.post("/build")
@@ -109,7 +137,7 @@ async def build(build_request: BuildRequest):
     Build landing page using new agent structure
     """
     try:
-        orchestrator = OrchestratorAgent()
+        orchestrator = _get_orchestrator()
         
         # Create event callback that sends events to backend
         event_callback = _create_event_callback(build_request.session_id)
@@ -155,17 +183,20 @@ async def build(build_request: BuildRequest):
                 bundle_path = Path(result["bundle_path"])
                 # If it's a zip, extract it; otherwise read from directory
                 if bundle_path.suffix == ".zip":
-                    import tempfile
                     import zipfile
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        with zipfile.ZipFile(bundle_path, 'r') as zip_ref:
-                            zip_ref.extractall(tmpdir)
-                            extracted_dir = Path(tmpdir)
-                            bundle_data = {
-                                "index_html": (extracted_dir / "index.html").read_text(encoding="utf-8") if (extracted_dir / "index.html").exists() else "",
-                                "styles_css": (extracted_dir / "styles.css").read_text(encoding="utf-8") if (extracted_dir / "styles.css").exists() else "",
-                                "app_js": (extracted_dir / "script.js").read_text(encoding="utf-8") if (extracted_dir / "script.js").exists() else ""
-                            }
+                    # Read the three text members straight from the archive
+                    # instead of extracting every asset to a temp directory
+                    with zipfile.ZipFile(bundle_path, 'r') as zip_ref:
+                        members = set(zip_ref.namelist())
+                        
+                        def read_member(name: str) -> str:
+                            return zip_ref.read(name).decode("utf-8") if name in members else ""
+                        
+                        bundle_data = {
+                            "index_html": read_member("index.html"),
+                            "styles_css": read_member("styles.css"),
+                            "app_js": read_member("script.js")
+                        }
                 else:
                     # Assume it's a directory
                     workdir = bundle_path
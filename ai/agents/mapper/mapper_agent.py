@@ -1,5 +1,5 @@
 """Mapper agent implementation based on mapper_agent_prompt_with_qa.md"""
-import asyncio
+from pathlib import Path
 from typing import Dict, Any, Optional
 from pydantic import ValidationError
 from agents.base_agent import BaseAgent, AgentError
@@ -11,7 +11,10 @@ class MapperAgent(BaseAgent):
     """Mapper agent - enriches Google Maps business data with web research"""
     
     def __init__(self, client, model: str = "gpt-4o", temperature: float = 0.7):
-        super().__init__(client, model, temperature, agent_name="Mapper")
+        super().__init__(
+            client, model, temperature,
+            agent_name="Mapper", agent_dir=Path(__file__).parent
+        )
         self.max_retries = 3
     
     async def run(
@@ -49,7 +52,6 @@ class MapperAgent(BaseAgent):
             
             if not qa_report.get("passed", True) and retry_count < self.max_retries:
                 print(f"[Mapper] QA checks failed, retrying (attempt {retry_count + 1}/{self.max_retries})")
-                await asyncio.sleep(min(2 ** retry_count, 5))  # Exponential backoff
                 return await self.run(google_data, retry_count + 1)
             
             return output_dict
@@ -57,7 +59,6 @@ class MapperAgent(BaseAgent):
         except ValidationError as e:
             print(f"[Mapper] Validation error: {e}")
             if retry_count < self.max_retries:
-                await asyncio.sleep(min(2 ** retry_count, 5))
                 return await self.run(google_data, retry_count + 1)
             raise AgentError(f"Mapper validation failed after {self.max_retries} retries: {e}")
         except Exception as e:
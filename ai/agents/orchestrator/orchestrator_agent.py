@@ -1,21 +1,37 @@
 
 """Orchestrator agent implementation based on orchestrator.md"""
 import os
+import re
 import asyncio
 import zipfile
 import json
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 from dotenv import load_dotenv
-from openai import OpenAI
 from agents.base_agent import BaseAgent, AgentError
+from agents.utils.json_utils import dumps_pretty
+from agents.utils.openai_client import get_client
 from agents.mapper.mapper_agent import MapperAgent
 from agents.generator.generator_agent import GeneratorAgent
 from agents.validator.validator_agent import ValidatorAgent
 
 logger = logging.getLogger(__name__)
 
+# Bundle members written without deflate (already-compressed formats)
+_STORED_SUFFIXES = {".webp", ".jpg", ".jpeg", ".png"}
+
+# Overall budget for downloading and optimizing images; a pathological source
+# image falls back to the listing's own image URLs instead of stalling the build
+IMAGE_PROCESSING_TIMEOUT = 30
+
+# List fields the agents expect on Google data, defaulted when absent
+_GOOGLE_LIST_FIELDS = ("types", "photos", "reviews")
+
+# Leading DOCTYPE check, anchored so only the start of the page is examined
+_DOCTYPE_RE = re.compile(r"\s*<!DOCTYPE")
+
 
 class OrchestratorAgent(BaseAgent):
     """Orchestrator - Coordinates mapper, generator, and validator agents"""
@@ -34,8 +50,11 @@ class OrchestratorAgent(BaseAgent):
         if not api_key or api_key.startswith("sk-xxxx") or "YOUR_" in api_key:
             raise ValueError("OPENAI_API_KEY not properly configured")
         
-        client = OpenAI(api_key=api_key)
-        super().__init__(client, model, temperature, agent_name="Orchestrator")
+        client = get_client(api_key)
+        super().__init__(
+            client, model, temperature,
+            agent_name="Orchestrator", agent_dir=Path(__file__).parent
+        )
         
         # Initialize agents
         self.mapper = MapperAgent(client)
@@ -116,6 +135,11 @@ class OrchestratorAgent(BaseAgent):
                     "orchestration_log": log
                 }
             
+            # Download and optimize images BEFORE the generator loop. They
+            # depend only on the mapper output, so retries reuse the result
+            # instead of downloading and re-encoding every image again
+            mapper_data_with_images = await self._prepare_images(mapper_out, workdir, event_callback)
+            
             # Step 3: Generate and Validate Loop
             while attempt <= max_attempts:
                 log.append({"step": "generator", "attempt": attempt, "timestamp": self._timestamp()})
@@ -124,22 +148,6 @@ class OrchestratorAgent(BaseAgent):
                 else:
                     self._emit_event(event_callback, "GENERATING", "Designing your landing page...")
                 
-                # Download and optimize images BEFORE generator call
-                from agents.utils.image_optimizer import image_optimizer
-                
-                self._emit_event(event_callback, "GENERATING", "Preparing images and media...")
-                try:
-                    image_metadata = await image_optimizer.process_and_optimize_images(mapper_out, workdir)
-                    logger.info(f"[Orchestrator] Image optimization completed: {len(image_metadata.get('images', []))} images")
-                    
-                    # Add image metadata to mapper_data for generator
-                    mapper_data_with_images = {**mapper_out, "optimized_images": image_metadata}
-                except Exception as e:
-                    logger.error(f"[Orchestrator] Image optimization failed: {e}", exc_info=True)
-                    self._emit_event(event_callback, "GENERATING", "Using images from business listing...")
-                    # Continue with original mapper_data if optimization fails
-                    mapper_data_with_images = mapper_out
-                
                 # Run Generator
                 gen_out = await self.generator.run(
                     google_data=google_data,
@@ -172,7 +180,13 @@ class OrchestratorAgent(BaseAgent):
                     workdir=str(workdir),
                     google_data=google_data,
                     mapper_data=mapper_out,
-                    tier=interactivity_tier
+                    tier=interactivity_tier,
+                    # Just written by _write_files; no need to read them back
+                    files={
+                        "index.html": gen_out["index_html"],
+                        "styles.css": gen_out["styles_css"],
+                        "script.js": gen_out["script_js"]
+                    }
                 )
                 
                 log.append({
@@ -196,15 +210,22 @@ class OrchestratorAgent(BaseAgent):
                 # Check severity-based validation logic
                 # Only security violations should block the build
                 violations = val_result.get("violations", [])
-                critical_violations = [
-                    v for v in violations 
-                    if v.get("severity") == "error" and v.get("id", "").startswith("SEC.")
-                ]
+                # Classify in one pass: SEC.* errors block, warnings are tallied.
+                # The tally is only reported for non-blocking results, so the
+                # scan stops at the first critical violation
+                has_critical = False
+                warning_count = 0
+                for v in violations:
+                    severity = v.get("severity")
+                    if severity == "warn":
+                        warning_count += 1
+                    elif severity == "error" and v.get("id", "").startswith("SEC."):
+                        has_critical = True
+                        break
                 
-                if val_result["status"] == "PASS" or len(critical_violations) == 0:
+                if val_result["status"] == "PASS" or not has_critical:
                     # Finalize - PASS or only non-critical violations
-                    if len(critical_violations) == 0 and violations:
-                        warning_count = len([v for v in violations if v.get("severity") == "warn"])
+                    if not has_critical and violations:
                         if warning_count > 0:
                             self._emit_event(event_callback, "READY", f"✓ Page ready with {warning_count} minor issue(s) - finalizing...")
                         else:
@@ -213,13 +234,14 @@ class OrchestratorAgent(BaseAgent):
                         self._emit_event(event_callback, "READY", "✓ Quality checks passed! Finalizing your page...")
                     
                     # Inject QA REPORT into index.html if missing
-                    self._inject_qa_report(workdir, val_result)
+                    index_html = self._inject_qa_report(workdir, val_result, gen_out["index_html"])
                     
-                    # Read bundle content before creating zip
+                    # Bundle content comes from the in-memory generator output
+                    # rather than reading back the files just written
                     bundle_content = {
-                        "index_html": (workdir / "index.html").read_text(encoding="utf-8") if (workdir / "index.html").exists() else "",
-                        "styles_css": (workdir / "styles.css").read_text(encoding="utf-8") if (workdir / "styles.css").exists() else "",
-                        "app_js": (workdir / "script.js").read_text(encoding="utf-8") if (workdir / "script.js").exists() else ""
+                        "index_html": index_html,
+                        "styles_css": gen_out["styles_css"],
+                        "app_js": gen_out["script_js"]
                     }
                     
                     # Create bundle.zip
@@ -231,13 +253,13 @@ class OrchestratorAgent(BaseAgent):
                         qa_report = qa_report.model_dump()
                     
                     qa_report_path = workdir / "qa_report.json"
-                    qa_report_path.write_text(json.dumps(qa_report, indent=2))
+                    qa_report_path.write_bytes(dumps_pretty(qa_report))
                     
                     mapper_out_path = workdir / "mapper_out.json"
-                    mapper_out_path.write_text(json.dumps(mapper_out, indent=2))
+                    mapper_out_path.write_bytes(dumps_pretty(mapper_out))
                     
                     log_path = workdir / "orchestration_log.json"
-                    log_path.write_text(json.dumps(log, indent=2))
+                    log_path.write_bytes(dumps_pretty(log))
                     
                     return {
                         "success": True,
@@ -280,15 +302,42 @@ class OrchestratorAgent(BaseAgent):
             logger.error(f"[Orchestrator] Exception: {e}\n{error_trace}")
             raise AgentError(f"Orchestration failed: {e}")
     
+    async def _prepare_images(
+        self,
+        mapper_out: Dict[str, Any],
+        workdir: Path,
+        event_callback: Optional[Callable[[str, str], None]]
+    ) -> Dict[str, Any]:
+        """Optimize mapper images into workdir; returns mapper data for the generator"""
+        from agents.utils.image_optimizer import image_optimizer
+        
+        self._emit_event(event_callback, "GENERATING", "Preparing images and media...")
+        try:
+            image_metadata = await asyncio.wait_for(
+                image_optimizer.process_and_optimize_images(mapper_out, workdir),
+                timeout=IMAGE_PROCESSING_TIMEOUT
+            )
+            logger.info(f"[Orchestrator] Image optimization completed: {len(image_metadata.get('images', []))} images")
+            
+            # Add image metadata to mapper_data for generator
+            return {**mapper_out, "optimized_images": image_metadata}
+        except asyncio.TimeoutError:
+            logger.error(f"[Orchestrator] Image optimization exceeded {IMAGE_PROCESSING_TIMEOUT}s, skipping")
+        except Exception as e:
+            logger.error(f"[Orchestrator] Image optimization failed: {e}", exc_info=True)
+        
+        # Continue with original mapper_data if optimization fails
+        self._emit_event(event_callback, "GENERATING", "Using images from business listing...")
+        return mapper_out
+    
     def _normalize_google_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Sanity-check and normalize Google data"""
-        # Ensure required fields exist with safe defaults
-        if "types" not in data:
-            data["types"] = []
-        if "photos" not in data:
-            data["photos"] = []
-        if "reviews" not in data:
-            data["reviews"] = []
+        # Ensure required fields exist with safe defaults. Copy-on-write: the
+        # caller's dict is returned as-is when complete, and only copied
+        # (shallowly, sharing all other fields) when a default must be added
+        missing = {key: [] for key in _GOOGLE_LIST_FIELDS if key not in data}
+        if missing:
+            return {**data, **missing}
         return data
     
     def _basic_schema_ok(self, mapper_out: Dict[str, Any]) -> bool:
@@ -312,20 +361,13 @@ class OrchestratorAgent(BaseAgent):
             assets_dir.mkdir(parents=True, exist_ok=True)
             # Assets would need to be downloaded/processed here if needed
     
-    def _inject_qa_report(self, workdir: Path, val_result: Dict[str, Any]):
-        """Inject QA REPORT comment into index.html if missing"""
-        index_path = workdir / "index.html"
-        if not index_path.exists():
-            return
-        
-        content = index_path.read_text(encoding="utf-8")
-        
+    def _inject_qa_report(self, workdir: Path, val_result: Dict[str, Any], content: str) -> str:
+        """Inject QA REPORT comment into index.html if missing; returns the final HTML"""
         # Check if QA REPORT already exists
         if "<!-- QA REPORT" in content:
-            return
+            return content
         
         # Create QA REPORT comment
-        qa_report = val_result["qa_report"]
         report_comment = f"""<!-- QA REPORT
 timestamp: {self._timestamp()}
 tier: {val_result.get("tier", "enhanced")}
@@ -335,13 +377,15 @@ fixed: {json.dumps([v["hint"] for v in val_result["violations"] if v["severity"]
 """
         
         # Insert at the top of HTML (after DOCTYPE if present)
-        if content.strip().startswith("<!DOCTYPE"):
-            lines = content.split("\n", 1)
-            content = lines[0] + "\n" + report_comment + (lines[1] if len(lines) > 1 else "")
+        # with a single join instead of chained concatenation
+        if _DOCTYPE_RE.match(content):
+            doctype, _, rest = content.partition("\n")
+            content = "".join((doctype, "\n", report_comment, rest))
         else:
             content = report_comment + content
         
-        index_path.write_text(content, encoding="utf-8")
+        (workdir / "index.html").write_text(content, encoding="utf-8")
+        return content
     
     def _create_bundle(self, workdir: Path) -> Path:
         """Create bundle.zip from workdir"""
@@ -352,15 +396,21 @@ fixed: {json.dumps([v["hint"] for v in val_result["violations"] if v["severity"]
             for file_path in workdir.rglob("*"):
                 if file_path.is_file() and file_path != bundle_path:  # Don't include the zip itself
                     arcname = file_path.relative_to(workdir)
-                    zipf.write(file_path, arcname)
+                    # Optimized images are already compressed; deflating them
+                    # again costs CPU for no size gain
+                    if file_path.suffix.lower() in _STORED_SUFFIXES:
+                        zipf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                    else:
+                        zipf.write(file_path, arcname)
         
         logger.info(f"[Orchestrator] Created bundle: {bundle_path}")
         return bundle_path
     
     def _timestamp(self) -> str:
         """Get current timestamp in ISO format"""
-        from datetime import datetime, timezone
-        return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        # An aware UTC isoformat() always ends in "+00:00"; swap the suffix
+        # directly instead of searching the string
+        return datetime.now(timezone.utc).isoformat()[:-6] + "Z"
     
     def _emit_event(self, callback: Optional[Callable[[str, str], None]], phase: str, message: str):
         """Emit event via callback if provided"""
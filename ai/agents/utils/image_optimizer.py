@@ -1,7 +1,9 @@
 """Image optimization utility for agent-generated assets"""
 import io
+import os
 import asyncio
 import aiohttp
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 from PIL import Image, ImageOps
@@ -41,6 +43,34 @@ IMAGE_SPECS = {
     }
 }
 
+# Downloads are rejected from headers alone when outside these bounds
+MIN_DOWNLOAD_BYTES = 4096  # Min 4KB
+MAX_DOWNLOAD_BYTES = 15 * 1024 * 1024
+
+# Connection pool bounds for one processing run: up to 11 downloads start at
+# once, mostly against a handful of image CDN hosts
+MAX_DOWNLOAD_CONNECTIONS = 8
+MAX_DOWNLOAD_CONNECTIONS_PER_HOST = 4
+
+# Image source per category, in processing order (used in log messages)
+_CATEGORY_SOURCES = {"logo": "logo", "section": "business image", "thumbnail": "stock image"}
+
+# Concurrent decode/resize/encode jobs (Pillow releases the GIL while coding)
+MAX_OPTIMIZE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Source formats that can be stored untouched when already within spec
+_PASSTHROUGH_EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg"}
+
+
+def _kb(size_bytes: float) -> float:
+    """
+    Size in KB rounded to 0.1, as reported in image metadata
+    
+    The metadata is embedded in every generator and validator prompt, so
+    full-precision floats would only add billed tokens.
+    """
+    return round(size_bytes / 1024, 1)
+
 
 class ImageOptimizer:
     """Optimizes images according to category specifications"""
@@ -49,23 +79,57 @@ class ImageOptimizer:
         self.total_size_bytes = 0
         self.max_total_size_bytes = 1.5 * 1024 * 1024  # 1.5 MB total limit
     
-    async def download_image(self, url: str, timeout: int = 6) -> Optional[bytes]:
-        """Download image from URL"""
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session shared by all downloads in one processing run"""
+        connector = aiohttp.TCPConnector(
+            limit=MAX_DOWNLOAD_CONNECTIONS,
+            limit_per_host=MAX_DOWNLOAD_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={"User-Agent": "ImageOptimizerBot/1.0"}
+        )
+    
+    async def download_image(
+        self,
+        url: str,
+        timeout: int = 6,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> Optional[bytes]:
+        """Download image from URL, reusing session's connection pool if given"""
+        if session is None:
+            async with self._create_session() as own_session:
+                return await self.download_image(url, timeout, own_session)
+        
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=timeout),
-                headers={"User-Agent": "ImageOptimizerBot/1.0"}
-            ) as session:
-                async with session.get(url, allow_redirects=True, max_redirects=5) as response:
-                    if 200 <= response.status < 300:
-                        content_type = response.headers.get("Content-Type", "").lower()
-                        if content_type.startswith("image/"):
-                            data = await response.read()
-                            if len(data) >= 4096:  # Min 4KB
-                                return data
-                            else:
-                                logger.warning(f"Image too small: {url} ({len(data)} bytes)")
-                    return None
+            async with session.get(
+                url,
+                allow_redirects=True,
+                max_redirects=5,
+                # Bounded per socket rather than in total: a total timeout would
+                # also count time spent queued for a pooled connection
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+            ) as response:
+                if 200 <= response.status < 300:
+                    content_type = response.headers.get("Content-Type", "").lower()
+                    if content_type.startswith("image/"):
+                        # Skip the body transfer when Content-Length already
+                        # rules the image out
+                        declared = response.content_length
+                        if declared is not None and declared < MIN_DOWNLOAD_BYTES:
+                            logger.warning(f"Image too small: {url} ({declared} bytes)")
+                            return None
+                        if declared is not None and declared > MAX_DOWNLOAD_BYTES:
+                            logger.warning(f"Image too large: {url} ({declared} bytes)")
+                            return None
+                        
+                        data = await response.read()
+                        if MIN_DOWNLOAD_BYTES <= len(data) <= MAX_DOWNLOAD_BYTES:
+                            return data
+                        else:
+                            logger.warning(f"Image size out of range: {url} ({len(data)} bytes)")
+                return None
         except Exception as e:
             logger.error(f"Error downloading image {url}: {e}")
             return None
@@ -96,6 +160,26 @@ class ImageOptimizer:
         # Use high-quality resampling
         return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
     
+    def _passthrough(
+        self,
+        img: Image.Image,
+        image_data: bytes,
+        spec: Dict[str, Any],
+        filename: str
+    ) -> Optional[Tuple[bytes, str, int, int]]:
+        """Return the original bytes if they already satisfy spec, else None"""
+        ext = _PASSTHROUGH_EXTENSIONS.get(img.format)
+        if ext is None or img.mode != "RGB" or "exif" in img.info:
+            return None
+        if ext == ".jpg" and not (spec.get("format") == "JPEG" or spec.get("fallback") == "JPEG"):
+            return None
+        
+        max_w, max_h = spec["max_res"]
+        width, height = img.size
+        if width > max_w or height > max_h or len(image_data) > spec["max_size_kb"] * 1024:
+            return None
+        return (image_data, filename.rsplit(".", 1)[0] + ext, width, height)
+    
     def _optimize_image(
         self,
         image_data: bytes,
@@ -123,30 +207,36 @@ class ImageOptimizer:
             logger.warning(f"SVG too large: {filename} ({len(image_data)} bytes)")
             return None
         
-        # Resize if needed
+        # Fast path: an RGB WebP/JPEG already within resolution and size limits
+        # is stored as-is, skipping a decode/resize/re-encode (and a second
+        # lossy generation). Images carrying EXIF are re-encoded to strip it.
+        if category != "logo":
+            passthrough = self._passthrough(img, image_data, spec, filename)
+            if passthrough:
+                return passthrough
+        
+        # Resize if needed. For JPEG sources, draft() lets libjpeg decode at
+        # 1/2, 1/4 or 1/8 scale (never below the target), so oversized photos
+        # skip most of the full-resolution decode before the LANCZOS resize
         max_w, max_h = spec["max_res"]
+        if img.format == "JPEG":
+            img.draft(None, (max_w, max_h))
         img = self._resize_with_aspect(img, max_w, max_h)
         width, height = img.size
         
-        # Convert RGBA to RGB for JPEG if no transparency needed (except logo)
+        # Flatten transparency onto white (only logos keep an alpha channel)
         output_format = spec.get("format", "WebP")
         if output_format in ("JPEG", "WebP") and category != "logo":
             if img.mode in ("RGBA", "LA", "P"):
-                # Convert transparent to white background for JPEG
-                if output_format == "JPEG" or not spec.get("transparent_bg", False):
-                    background = Image.new("RGB", img.size, (255, 255, 255))
-                    if img.mode == "RGBA":
-                        background.paste(img, mask=img.split()[3])
-                    else:
-                        background.paste(img)
-                    img = background
-                elif output_format == "WebP" and img.mode == "RGBA":
-                    # Keep transparency for WebP
-                    pass
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                if img.mode == "RGBA":
+                    background.paste(img, mask=img.split()[3])
+                else:
+                    background.paste(img)
+                img = background
         
         # Optimize and convert
         output = io.BytesIO()
-        optimize_kwargs = {}
         
         if output_format == "WebP" or spec.get("prefer_webp", False):
             # Try WebP first
@@ -168,10 +258,9 @@ class ImageOptimizer:
         
         elif output_format == "PNG":
             # PNG optimization (for logos)
-            optimize_kwargs = {"optimize": True}
             if spec.get("transparent_bg", False):
                 # Keep transparency
-                img.save(output, format="PNG", **optimize_kwargs)
+                img.save(output, format="PNG", optimize=True)
             else:
                 # Convert to RGB
                 if img.mode in ("RGBA", "LA", "P"):
@@ -181,7 +270,7 @@ class ImageOptimizer:
                     else:
                         background.paste(img)
                     img = background
-                img.save(output, format="PNG", **optimize_kwargs)
+                img.save(output, format="PNG", optimize=True)
             
             optimized_data = output.getvalue()
             if len(optimized_data) <= spec["max_size_kb"] * 1024:
@@ -214,133 +303,118 @@ class ImageOptimizer:
         Returns:
             Dict with optimized image metadata for use in HTML generation
         """
+        # One session per run so every download shares a connection pool
+        async with self._create_session() as session:
+            return await self._process_images(mapper_data, workdir, session)
+    
+    async def _download_and_optimize(
+        self,
+        url: str,
+        category: str,
+        name: str,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Optional[bytes], Optional[Tuple[bytes, str, int, int]]]:
+        """Download one image and optimize it off the event loop"""
+        img_data = await self.download_image(url, session=session)
+        if not img_data:
+            return img_data, None
+        async with semaphore:
+            result = await asyncio.to_thread(self._optimize_image, img_data, category, name)
+        return img_data, result
+    
+    async def _process_images(
+        self,
+        mapper_data: Dict[str, Any],
+        workdir: Path,
+        session: aiohttp.ClientSession
+    ) -> Dict[str, Any]:
+        """Download and optimize images using a shared HTTP session"""
         assets_dir = workdir / "assets" / "images"
         assets_dir.mkdir(parents=True, exist_ok=True)
         
         optimized_images = []
+        # Optimized section bytes by filename, reused for the hero variant
+        # instead of reading the just-written file back from disk
+        section_bytes: Dict[str, bytes] = {}
         self.total_size_bytes = 0
         
-        # Get logo (if present)
-        logo_url = mapper_data.get("assats", {}).get("logo_url")
-        if logo_url:
-            logger.info(f"[ImageOptimizer] Processing logo: {logo_url}")
-            img_data = await self.download_image(logo_url)
-            if img_data:
-                result = self._optimize_image(img_data, "logo", "logo")
-                if result:
-                    optimized_bytes, filename, width, height = result
-                    
-                    # Check total size limit
-                    if self.total_size_bytes + len(optimized_bytes) > self.max_total_size_bytes:
-                        logger.warning("Total bundle size limit reached, skipping logo")
-                    else:
-                        # Save image
-                        logo_path = assets_dir / filename
-                        logo_path.write_bytes(optimized_bytes)
-                        self.total_size_bytes += len(optimized_bytes)
-                        
-                        optimized_images.append({
-                            "type": "logo",
-                            "filename": filename,
-                            "path": f"assets/images/{filename}",
-                            "width": width,
-                            "height": height,
-                            "size_kb": len(optimized_bytes) / 1024
-                        })
-                        logger.info(f"[ImageOptimizer] Saved logo: {filename} ({len(optimized_bytes)/1024:.1f}KB, {width}x{height})")
+        assats = mapper_data.get("assats", {})
+        logo_url = assats.get("logo_url")
+        # Empty/null URL entries are skipped lazily rather than sliced in, so
+        # they neither take a slot nor start a download that cannot succeed
+        business_images = list(islice(filter(None, assats.get("business_images_urls") or ()), 4))  # Limit to 4 section images
+        stock_images = list(islice(filter(None, assats.get("stock_images_urls") or ()), 6))  # Limit to 6 thumbnails
         
-        # Get business images (categorize as section/feature images)
-        business_images = mapper_data.get("assats", {}).get("business_images_urls", [])
-        if business_images:
-            # Limit to 4 section images - download in parallel for speed
-            business_tasks = []
-            for i, url in enumerate(business_images[:4]):
-                logger.info(f"[ImageOptimizer] Queueing business image {i+1}: {url}")
-                business_tasks.append((i, url, self.download_image(url)))
+        # Start every download up front so the logo, business and stock images
+        # transfer concurrently (each download has its own 6s connect/read timeouts), and
+        # optimize each one in a worker thread as soon as it arrives. Budget
+        # checks and saves below still run in the original order.
+        # Jobs are (url, category, filename stem, log label)
+        jobs = ([(logo_url, "logo", "logo", "logo")] if logo_url else []) + [
+            (url, "section", f"business_{i}", f"business image {i+1}")
+            for i, url in enumerate(business_images)
+        ] + [
+            (url, "thumbnail", f"stock_{i}", f"stock image {i+1}")
+            for i, url in enumerate(stock_images)
+        ]
+        for url, _, _, _ in jobs:
+            logger.info(f"[ImageOptimizer] Queueing image: {url}")
+        semaphore = asyncio.Semaphore(MAX_OPTIMIZE_WORKERS)
+        results = await asyncio.gather(
+            *(
+                self._download_and_optimize(url, category, name, session, semaphore)
+                for url, category, name, _ in jobs
+            ),
+            return_exceptions=True
+        )
+        # Budget checks and saves, in job order. A category stops at its first
+        # size-limit hit; per-category byte totals replace rescanning the list
+        category_bytes = dict.fromkeys(_CATEGORY_SOURCES, 0)
+        stopped = set()
+        for (url, category, _, label), entry in zip(jobs, results):
+            if category in stopped:
+                continue
+            source = _CATEGORY_SOURCES[category]
+            if isinstance(entry, Exception):
+                logger.error(f"[ImageOptimizer] Failed to process {label}: {entry}")
+                continue
+            img_data, result = entry
+            if not img_data:
+                logger.warning(f"[ImageOptimizer] No image data returned for {label}: {url}")
+                continue
+            if not result:
+                continue
             
-            # Download all in parallel with timeout per image (each has 6s timeout)
-            business_results = await asyncio.gather(*[task[2] for task in business_tasks], return_exceptions=True)
+            optimized_bytes, filename, width, height = result
+            size = len(optimized_bytes)
             
-            for (i, url, _), img_data in zip(business_tasks, business_results):
-                if isinstance(img_data, Exception):
-                    logger.error(f"[ImageOptimizer] Failed to download business image {i+1}: {img_data}")
-                    continue
-                if not img_data:
-                    logger.warning(f"[ImageOptimizer] No image data returned for business image {i+1}: {url}")
-                    continue
-                result = self._optimize_image(img_data, "section", f"business_{i}")
-                if result:
-                    optimized_bytes, filename, width, height = result
-                    
-                    if self.total_size_bytes + len(optimized_bytes) > self.max_total_size_bytes:
-                        logger.warning("Total bundle size limit reached, stopping image processing")
-                        break
-                    
-                    # Save image
-                    img_path = assets_dir / filename
-                    img_path.write_bytes(optimized_bytes)
-                    self.total_size_bytes += len(optimized_bytes)
-                    
-                    optimized_images.append({
-                        "type": "section",
-                        "filename": filename,
-                        "path": f"assets/images/{filename}",
-                        "width": width,
-                        "height": height,
-                        "size_kb": len(optimized_bytes) / 1024
-                    })
-                    logger.info(f"[ImageOptimizer] Saved business image: {filename} ({len(optimized_bytes)/1024:.1f}KB, {width}x{height})")
-        
-        # Get stock images (categorize as thumbnails/gallery)
-        stock_images = mapper_data.get("assats", {}).get("stock_images_urls", [])
-        if stock_images:
-            # Limit to 6 thumbnails - download in parallel for speed
-            stock_tasks = []
-            for i, url in enumerate(stock_images[:6]):
-                logger.info(f"[ImageOptimizer] Queueing stock image {i+1}: {url}")
-                stock_tasks.append((i, url, self.download_image(url)))
+            category_max_kb = IMAGE_SPECS[category].get("total_max_kb")
+            if category_max_kb and category_bytes[category] + size > category_max_kb * 1024:
+                logger.warning("Thumbnail gallery size limit reached")
+                stopped.add(category)
+                continue
+            if self.total_size_bytes + size > self.max_total_size_bytes:
+                logger.warning(f"Total bundle size limit reached, stopping {source} processing")
+                stopped.add(category)
+                continue
             
-            # Download all in parallel with timeout per image
-            stock_results = await asyncio.gather(*[task[2] for task in stock_tasks], return_exceptions=True)
+            # Save image
+            (assets_dir / filename).write_bytes(optimized_bytes)
+            if category == "section":
+                section_bytes[filename] = optimized_bytes
+            category_bytes[category] += size
+            self.total_size_bytes += size
             
-            for (i, url, _), img_data in zip(stock_tasks, stock_results):
-                if isinstance(img_data, Exception):
-                    logger.error(f"[ImageOptimizer] Failed to download stock image {i+1}: {img_data}")
-                    continue
-                if not img_data:
-                    logger.warning(f"[ImageOptimizer] No image data returned for stock image {i+1}: {url}")
-                    continue
-                result = self._optimize_image(img_data, "thumbnail", f"stock_{i}")
-                if result:
-                    optimized_bytes, filename, width, height = result
-                    
-                    thumbnail_total = sum(
-                        img.get("size_kb", 0) * 1024 
-                        for img in optimized_images 
-                        if img.get("type") == "thumbnail"
-                    )
-                    if thumbnail_total + len(optimized_bytes) > IMAGE_SPECS["thumbnail"]["total_max_kb"] * 1024:
-                        logger.warning("Thumbnail gallery size limit reached")
-                        break
-                    
-                    if self.total_size_bytes + len(optimized_bytes) > self.max_total_size_bytes:
-                        logger.warning("Total bundle size limit reached, stopping image processing")
-                        break
-                    
-                    # Save image
-                    img_path = assets_dir / filename
-                    img_path.write_bytes(optimized_bytes)
-                    self.total_size_bytes += len(optimized_bytes)
-                    
-                    optimized_images.append({
-                        "type": "thumbnail",
-                        "filename": filename,
-                        "path": f"assets/images/{filename}",
-                        "width": width,
-                        "height": height,
-                        "size_kb": len(optimized_bytes) / 1024
-                    })
-                    logger.info(f"[ImageOptimizer] Saved stock image: {filename} ({len(optimized_bytes)/1024:.1f}KB, {width}x{height})")
+            optimized_images.append({
+                "type": category,
+                "filename": filename,
+                "path": f"assets/images/{filename}",
+                "width": width,
+                "height": height,
+                "size_kb": _kb(size)
+            })
+            logger.info(f"[ImageOptimizer] Saved {source}: {filename} ({size/1024:.1f}KB, {width}x{height})")
         
         # Identify hero image (first section image, optimized to hero spec if needed)
         hero_image = None
@@ -348,11 +422,12 @@ class ImageOptimizer:
             if img["type"] == "section":
                 # If section image is too large for hero spec, create hero version
                 if img["width"] > 1920 or img["height"] > 1080 or img.get("size_kb", 0) > 400:
-                    # Read the original optimized file and re-optimize for hero
-                    img_path = assets_dir / img["filename"]
-                    if img_path.exists():
-                        hero_data = img_path.read_bytes()
-                        hero_result = self._optimize_image(hero_data, "hero", f"hero_{img['filename']}")
+                    # Re-optimize the in-memory section bytes for hero
+                    hero_data = section_bytes.get(img["filename"])
+                    if hero_data:
+                        hero_result = await asyncio.to_thread(
+                            self._optimize_image, hero_data, "hero", f"hero_{img['filename']}"
+                        )
                         if hero_result:
                             optimized_bytes, filename, width, height = hero_result
                             hero_path = assets_dir / filename
@@ -363,7 +438,7 @@ class ImageOptimizer:
                                 "path": f"assets/images/{filename}",
                                 "width": width,
                                 "height": height,
-                                "size_kb": len(optimized_bytes) / 1024
+                                "size_kb": _kb(len(optimized_bytes))
                             }
                 else:
                     # Use section image as hero as-is
@@ -375,7 +450,7 @@ class ImageOptimizer:
         return {
             "images": optimized_images,
             "hero_image": hero_image,
-            "total_size_kb": self.total_size_bytes / 1024,
+            "total_size_kb": _kb(self.total_size_bytes),
             "logo": next((img for img in optimized_images if img["type"] == "logo"), None)
         }
 
@@ -0,0 +1,52 @@
+"""JSON helpers with an orjson fast path and stdlib fallback"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to stdlib json
+    orjson = None
+
+
+def dumps_pretty(data: Any) -> bytes:
+    """Serialize data as indented UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dumps_compact(data: Any, sort_keys: bool = False) -> bytes:
+    """Serialize data as compact UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def dumps_line(data: Any) -> bytes:
+    """Serialize data as a single JSON Lines record (trailing newline)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def raw_json(encoded: bytes, data: Any) -> Any:
+    """
+    Embed already-encoded JSON in a document without re-encoding it
+    
+    Uses orjson.Fragment when available; otherwise returns the original data
+    so the stdlib encoder serializes it again.
+    """
+    fragment = getattr(orjson, "Fragment", None)
+    if fragment is not None:
+        return fragment(encoded)
+    return data
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON text or bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,128 @@
+"""Exact-match response cache for deterministic agent calls"""
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from agents.utils.json_utils import dumps_compact
+
+logger = logging.getLogger(__name__)
+
+# Only near-deterministic calls are worth replaying from cache
+CACHEABLE_MAX_TEMPERATURE = 0.1
+
+# Entries older than this are treated as misses in both tiers
+LLM_CACHE_TTL_SECONDS = 24 * 3600
+
+# Number of distinct system prompts / schema notes whose digests are memoized;
+# bounded so prompts built per call cannot pin memory in long-running workers
+PROMPT_DIGEST_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=PROMPT_DIGEST_CACHE_SIZE)
+def prompt_digest(prompt: str) -> str:
+    """Return a stable BLAKE2b digest of a system prompt, computed once per prompt"""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier (memory LRU + optional disk) cache of chat completion texts
+    
+    Entries are keyed by a SHA-256 of the full request kwargs (model,
+    messages, temperature, response_format), so only byte-identical requests
+    hit. The disk tier is enabled by passing cache_dir and survives restarts.
+    Entries in both tiers expire after ttl_seconds.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        cache_dir: Optional[str] = None,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.ttl_seconds = ttl_seconds
+        # key -> (monotonic store time, completion text)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def cache_key(request_kwargs: Dict[str, Any]) -> str:
+        """
+        Hash request kwargs into a stable hex key
+        
+        System messages are represented by their memoized prompt digest, so
+        only the per-call user payload is re-encoded and hashed each time.
+        """
+        key_payload = dict(request_kwargs)
+        key_payload["messages"] = [
+            {"role": "system", "digest": prompt_digest(m["content"])}
+            if m["role"] == "system" else m
+            for m in request_kwargs["messages"]
+        ]
+        return hashlib.sha256(dumps_compact(key_payload, sort_keys=True)).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion text for key, or None if absent or expired"""
+        content = None
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, cached = entry
+            if time.monotonic() - stored_at <= self.ttl_seconds:
+                content = cached
+                self._entries.move_to_end(key)
+            else:
+                del self._entries[key]
+        elif self.cache_dir:
+            content = self._read_disk(key)
+        
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.debug("LLM cache hit %s (hits=%d misses=%d)", key[:12], self.hits, self.misses)
+        return content
+    
+    def set(self, key: str, content: str) -> None:
+        """Store completion text under key"""
+        self._remember(key, content, time.monotonic())
+        if self.cache_dir:
+            try:
+                (self.cache_dir / f"{key}.json").write_text(content, encoding="utf-8")
+            except OSError as e:
+                logger.debug("LLM cache disk write failed for %s: %s", key[:12], e)
+    
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Load a fresh entry from the disk tier into memory, removing it if expired"""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            # Disk entries outlive the process, so their age comes from the file mtime
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            content = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._remember(key, content, time.monotonic() - age)
+        return content
+    
+    def _remember(self, key: str, content: str, stored_at: float) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._entries[key] = (stored_at, content)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global cache instance
+llm_cache = LLMCache(cache_dir=os.getenv("AGENT_LLM_CACHE_DIR") or None)
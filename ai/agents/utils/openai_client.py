@@ -0,0 +1,40 @@
+"""Process-wide AsyncOpenAI client shared by all agents"""
+from typing import Dict
+import httpx
+from openai import AsyncOpenAI
+
+try:
+    import h2  # noqa: F401 - httpx only enables HTTP/2 when h2 is installed
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# One client (and connection pool) per API key for the process lifetime
+_shared_clients: Dict[str, AsyncOpenAI] = {}
+
+
+def get_client(api_key: str) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for api_key, creating it on first use
+    
+    Reusing one httpx pool keeps TLS sessions and keep-alive connections warm
+    across builds, agents, and retries instead of handshaking per orchestrator.
+    """
+    client = _shared_clients.get(api_key)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(180.0, connect=10.0)
+        )
+        client = AsyncOpenAI(api_key=api_key, http_client=http_client)
+        _shared_clients[api_key] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close every shared client's connection pool (call at process shutdown)"""
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.close()
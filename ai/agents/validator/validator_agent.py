@@ -7,12 +7,18 @@ from agents.base_agent import BaseAgent, AgentError
 from agents.validator.validator_prompt import VALIDATOR_SYSTEM_PROMPT
 from agents.validator.validator_schemas import ValidatorOutput, VALIDATOR_RESPONSE_SCHEMA
 
+# Bundle files sent to the validator, in prompt order
+VALIDATED_FILES = ("index.html", "styles.css", "script.js")
+
 
 class ValidatorAgent(BaseAgent):
     """Validator agent - independent, strict final QA for generated bundle"""
     
     def __init__(self, client, model: str = "gpt-4o", temperature: float = 0.3):
-        super().__init__(client, model, temperature, agent_name="Validator")
+        super().__init__(
+            client, model, temperature,
+            agent_name="Validator", agent_dir=Path(__file__).parent
+        )
         # Lower temperature for more deterministic validation
     
     async def run(
@@ -20,7 +26,8 @@ class ValidatorAgent(BaseAgent):
         workdir: str,
         google_data: Dict[str, Any],
         mapper_data: Dict[str, Any],
-        tier: str = "enhanced"
+        tier: str = "enhanced",
+        files: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Validate generated bundle
@@ -30,6 +37,8 @@ class ValidatorAgent(BaseAgent):
             google_data: Original Google Maps data
             mapper_data: Mapper agent output
             tier: Interactivity tier expected
+            files: Contents of index.html, styles.css and script.js if the
+                caller already has them; read from workdir otherwise
             
         Returns:
             Validator output with status, violations, and repair suggestions
@@ -38,21 +47,21 @@ class ValidatorAgent(BaseAgent):
         workdir_path = Path(workdir)
         
         files_data = {}
-        for filename in ["index.html", "styles.css", "script.js"]:
-            filepath = workdir_path / filename
-            if filepath.exists():
-                files_data[filename] = filepath.read_text(encoding="utf-8")
-            else:
+        for filename in VALIDATED_FILES:
+            if files is not None and filename in files:
+                files_data[filename] = files[filename]
+                continue
+            try:
+                files_data[filename] = (workdir_path / filename).read_text(encoding="utf-8")
+            except FileNotFoundError:
                 files_data[filename] = ""
         
-        # List assets if directory exists
-        assets_dir = workdir_path / "assets" / "images"
-        assets_list = []
-        if assets_dir.exists() and assets_dir.is_dir():
-            assets_list = [f.name for f in assets_dir.iterdir() if f.is_file()]
+        # Scan assets once: names feed the prompt, sizes feed the metrics
+        asset_sizes = self._scan_assets(workdir_path / "assets" / "images")
+        assets_list = list(asset_sizes)
         
         # Calculate metrics
-        metrics = self._calculate_metrics(workdir_path, files_data)
+        metrics = self._calculate_metrics(files_data, asset_sizes)
         
         user_message = {
             "workdir": str(workdir),
@@ -79,7 +88,19 @@ class ValidatorAgent(BaseAgent):
             print(f"[Validator] Error: {e}")
             raise AgentError(f"Validator failed: {e}")
     
-    def _calculate_metrics(self, workdir_path: Path, files_data: Dict[str, str]) -> Dict[str, Any]:
+    def _scan_assets(self, assets_dir: Path) -> Dict[str, int]:
+        """Map asset file names to byte sizes in a single directory pass"""
+        asset_sizes = {}
+        try:
+            with os.scandir(assets_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        asset_sizes[entry.name] = entry.stat().st_size
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return asset_sizes
+    
+    def _calculate_metrics(self, files_data: Dict[str, str], asset_sizes: Dict[str, int]) -> Dict[str, Any]:
         """Calculate basic metrics for validation"""
         metrics = {}
         
@@ -95,18 +116,8 @@ class ValidatorAgent(BaseAgent):
             metrics["css_size_kb"] = round(len(css_bytes) / 1024.0, 2)
         
         # Count images
-        assets_dir = workdir_path / "assets" / "images"
-        image_count = 0
-        total_image_weight_mb = 0.0
-        
-        if assets_dir.exists() and assets_dir.is_dir():
-            for img_file in assets_dir.iterdir():
-                if img_file.is_file():
-                    image_count += 1
-                    total_image_weight_mb += img_file.stat().st_size / (1024 * 1024)
-        
-        metrics["image_count"] = image_count
-        metrics["total_image_weight_mb"] = round(total_image_weight_mb, 2)
+        metrics["image_count"] = len(asset_sizes)
+        metrics["total_image_weight_mb"] = round(sum(asset_sizes.values()) / (1024 * 1024), 2)
         
         return metrics
 
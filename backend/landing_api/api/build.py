@@ -5,14 +5,14 @@ from landing_api.models.errors import ApplicationError, ErrorCode
 from landing_api.core.google_fetcher import google_fetcher
 from landing_api.core.artifact_store import artifact_store
 from landing_api.core.state_machine import BuildState, BuildPhase
-from landing_api.core.agents_client import agents_client
-from landing_api.core.config import settings
+from landing_api.core.agents_client import agents_client, BUNDLE_KEY_ALIASES
+import os
 import uuid
+import time
 import asyncio
 import shutil
 import logging
 import json
-from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
@@ -22,6 +22,14 @@ logger = logging.getLogger(__name__)
 # In-memory session store (in production, use Redis or similar)
 session_store = {}
 
+# Artifacts expire after an hour, so scanning the artifact directory on every
+# build request is wasted work; scan at most once per interval
+ARTIFACT_CLEANUP_INTERVAL_SECONDS = 300
+_last_artifact_cleanup = float("-inf")
+
+# Files every bundle returned by the agents service must contain
+REQUIRED_BUNDLE_KEYS = ("index_html", "styles_css", "app_js")
+
 
 # ============================================================================
 # Helper Functions
@@ -50,13 +58,7 @@ def _calculate_data_richness(place_data: Dict[str, Any]) -> Dict[str, bool]:
 
 def _normalize_bundle_keys(bundle: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize bundle keys from 'file.ext' to 'file_ext' format"""
-    key_mapping = {
-        "index.html": "index_html",
-        "styles.css": "styles_css",
-        "app.js": "app_js"
-    }
-    
-    for old_key, new_key in key_mapping.items():
+    for new_key, old_key in BUNDLE_KEY_ALIASES:
         if old_key in bundle and new_key not in bundle:
             bundle[new_key] = bundle.pop(old_key)
     
@@ -65,8 +67,7 @@ def _normalize_bundle_keys(bundle: Dict[str, Any]) -> Dict[str, Any]:
 
 def _validate_bundle(bundle: Dict[str, Any], session_id: str) -> None:
     """Validate bundle has all required files"""
-    required_keys = ["index_html", "styles_css", "app_js"]
-    missing_keys = [key for key in required_keys if key not in bundle]
+    missing_keys = [key for key in REQUIRED_BUNDLE_KEYS if key not in bundle]
     
     if missing_keys:
         logger.error(f"Session {session_id}: Missing bundle keys: {missing_keys}")
@@ -290,25 +291,34 @@ async def cleanup_old_sessions() -> None:
 
 
 def _cleanup_old_artifacts() -> None:
-    """Clean up artifacts older than 1 hour"""
-    artifacts_path = Path(settings.asset_store).resolve()
+    """Clean up artifacts older than 1 hour (at most once per cleanup interval)"""
+    global _last_artifact_cleanup
+    now = time.monotonic()
+    if now - _last_artifact_cleanup < ARTIFACT_CLEANUP_INTERVAL_SECONDS:
+        return
+    _last_artifact_cleanup = now
+    
+    artifacts_path = artifact_store.base_path
     
     if not artifacts_path.exists():
         return
     
     try:
-        cutoff_time = datetime.utcnow() - timedelta(hours=1)
+        # Compare raw st_ctime values; scandir reports entry types without an
+        # extra stat per entry, and no datetime is built per directory
+        cutoff_ts = time.time() - 3600
         items_cleaned = 0
         
-        for item in artifacts_path.iterdir():
-            if item.is_dir():
+        with os.scandir(artifacts_path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
                 try:
-                    creation_time = datetime.utcfromtimestamp(item.stat().st_ctime)
-                    if creation_time < cutoff_time:
-                        shutil.rmtree(item)
+                    if entry.stat().st_ctime < cutoff_ts:
+                        shutil.rmtree(entry.path)
                         items_cleaned += 1
                 except Exception as e:
-                    logger.warning(f"Error removing {item.name}: {e}")
+                    logger.warning(f"Error removing {entry.name}: {e}")
         
         if items_cleaned > 0:
             logger.info(f"Cleaned up {items_cleaned} old artifact directories")
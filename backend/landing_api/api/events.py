@@ -8,6 +8,10 @@ from landing_api.api.build import session_store
 
 router = APIRouter()
 
+# Phase names sent by the agents service, mapped once at import; unknown
+# names fall back to IDLE
+PHASES_BY_NAME = {phase.value: phase for phase in BuildPhase}
+
 
 class EventRequest(BaseModel):
     """Event message from agents service"""
@@ -33,16 +37,7 @@ async def receive_event(event: EventRequest):
         return {"status": "accepted", "session_found": False}
     
     # Map phase string to BuildPhase enum
-    phase_map = {
-        "FETCHING": BuildPhase.FETCHING,
-        "ORCHESTRATING": BuildPhase.ORCHESTRATING,
-        "GENERATING": BuildPhase.GENERATING,
-        "QA": BuildPhase.QA,
-        "READY": BuildPhase.READY,
-        "ERROR": BuildPhase.ERROR
-    }
-    
-    phase = phase_map.get(event.phase, BuildPhase.IDLE)
+    phase = PHASES_BY_NAME.get(event.phase, BuildPhase.IDLE)
     
     # Log the event
     print(f"[Events] Received event from agents: phase={event.phase}, detail='{event.detail}', session={event.session_id}", flush=True)
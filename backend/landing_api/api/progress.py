@@ -15,6 +15,29 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _event_frame(session_id: str, event: dict) -> str:
+    """
+    SSE frame for a logged event
+    
+    Logged events never change, so each is serialized once and the frame is
+    stored on the event itself, shared by every stream (and reconnect) for
+    the session instead of being re-validated and re-dumped per client.
+    """
+    frame = event.get("_sse_frame")
+    if frame is None:
+        e = ProgressEvent(
+            ts=event["ts"],
+            session_id=session_id,
+            phase=event["phase"],
+            step="",
+            detail=event["detail"],
+            progress=0.0
+        )
+        frame = f"data: {e.model_dump_json()}\n\n"
+        event["_sse_frame"] = frame
+    return frame
+
+
 @router.get("/progress/{session_id}")
 async def stream_progress(session_id: str):
     """
@@ -33,11 +56,12 @@ async def stream_progress(session_id: str):
     logger.info(f"SSE ENDPOINT: /sse/progress/{session_id} - Request received")
     
     state = session_store.get(session_id)
-    logger.debug(f"SSE ENDPOINT: Session lookup result: {state is not None}")
+    logger.debug("SSE ENDPOINT: Session lookup result: %s", state is not None)
     
     if not state:
         logger.warning(f"SSE ENDPOINT: Session NOT FOUND: {session_id}")
-        logger.debug(f"SSE ENDPOINT: Available sessions: {list(session_store.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SSE ENDPOINT: Available sessions: %s", list(session_store.keys()))
         raise HTTPException(status_code=404, detail="Session not found")
     
     logger.info(f"SSE ENDPOINT: Session found, starting stream for phase: {state.phase}")
@@ -48,19 +72,11 @@ async def stream_progress(session_id: str):
         iteration = 0
         
         # Send all existing events immediately
-        logger.debug(f"SSE: Sending {len(state.event_log)} existing events for session {session_id}")
+        logger.debug("SSE: Sending %d existing events for session %s", len(state.event_log), session_id)
         last_event_count = len(state.event_log)
         
         for event in state.event_log:
-            e = ProgressEvent(
-                ts=event["ts"],
-                session_id=session_id,
-                phase=event["phase"],
-                step="",
-                detail=event["detail"],
-                progress=0.0
-            )
-            yield f"data: {e.model_dump_json()}\n\n"
+            yield _event_frame(session_id, event)
         
         while iteration < max_iterations:
             iteration += 1
@@ -85,18 +101,10 @@ async def stream_progress(session_id: str):
             if current_event_count > last_event_count:
                 # Send only new events
                 new_events = state.event_log[last_event_count:]
-                logger.debug(f"SSE: Sending {len(new_events)} new events for session {session_id}")
+                logger.debug("SSE: Sending %d new events for session %s", len(new_events), session_id)
                 
                 for event in new_events:
-                    e = ProgressEvent(
-                        ts=event["ts"],
-                        session_id=session_id,
-                        phase=event["phase"],
-                        step="",
-                        detail=event["detail"],
-                        progress=0.0
-                    )
-                    yield f"data: {e.model_dump_json()}\n\n"
+                    yield _event_frame(session_id, event)
                 
                 last_event_count = current_event_count
             
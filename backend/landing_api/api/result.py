@@ -7,9 +7,64 @@ from landing_api.api.build import session_store
 from landing_api.core.config import settings
 import os
 import re
+from collections import OrderedDict
+from typing import Dict
 
 router = APIRouter()
 
+# Asset references rewritten when CSS/JS are served as separate files: a
+# <link href> to styles.css or a <script src> to app.js, matched in one pass.
+# Pages are rendered as UTF-8 bytes, so the patterns are bytes patterns too
+_ASSET_REF_RE = re.compile(
+    rb'(?:(?P<css><link[^>]*href=["\'])[^"\']*styles\.css'
+    rb'|(?P<js><script[^>]*src=["\'])[^"\']*app\.js)'
+    rb'(?P<end>["\'][^>]*>)',
+    re.IGNORECASE
+)
+
+# Closing tags that inlined CSS/JS are inserted before
+_INLINE_ANCHOR_RE = re.compile(rb'</head>|</body>')
+
+# Rendered pages of recently viewed READY sessions, kept as encoded bytes so
+# cache hits are sent without re-encoding
+RENDERED_PAGE_CACHE_SIZE = 64
+_rendered_pages: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+def _render_page(session_id: str, bundle: Dict[str, str]) -> bytes:
+    """Render index.html (UTF-8) with CSS/JS either inlined or linked to served assets"""
+    # Check if should inline CSS/JS
+    should_inline = artifact_store.should_inline(bundle)
+    
+    # Get base URL for assets
+    base_url = f"/api/result/{session_id}"
+    assets_base = f"/assets/{session_id}"
+    
+    # Prepare HTML response
+    html = bundle["index_html"].encode("utf-8")
+    
+    if should_inline:
+        # Inline CSS and JS in one pass over the page
+        inlined = {
+            b"</head>": f"<style>\n{bundle['styles_css']}\n</style></head>".encode("utf-8"),
+            b"</body>": f"<script>\n{bundle['app_js']}\n</script></body>".encode("utf-8")
+        }
+        html = _INLINE_ANCHOR_RE.sub(lambda match: inlined[match.group()], html)
+    else:
+        # Update existing href/src attributes to point to correct asset paths
+        # (handles any attribute order)
+        css_ref = f"{assets_base}/styles.css".encode("utf-8")
+        js_ref = f"{assets_base}/app.js".encode("utf-8")
+        
+        def rewrite_asset_ref(match: re.Match) -> bytes:
+            if match.group("css"):
+                return match.group("css") + css_ref + match.group("end")
+            return match.group("js") + js_ref + match.group("end")
+        
+        html = _ASSET_REF_RE.sub(rewrite_asset_ref, html)
+    
+    return html
+
 
 @router.get("/result/{session_id}")
 async def get_result(session_id: str) -> Response:
@@ -20,6 +75,8 @@ async def get_result(session_id: str) -> Response:
     # Get state
     state = session_store.get(session_id)
     if not state:
+        # Drop any page rendered before the session was cleaned up
+        _rendered_pages.pop(session_id, None)
         raise HTTPException(status_code=404, detail="Session not found")
     
     # Check if READY
@@ -30,41 +87,24 @@ async def get_result(session_id: str) -> Response:
             detail=f"Build not ready. Current phase: {state.phase}"
         )
     
-    # Load bundle from artifact store
-    bundle = artifact_store.load_bundle(session_id)
-    if not bundle:
-        raise HTTPException(status_code=404, detail="Bundle not found")
-    
-    # Check if should inline CSS/JS
-    should_inline = artifact_store.should_inline(bundle)
-    
-    # Get base URL for assets
-    base_url = f"/api/result/{session_id}"
-    assets_base = f"/assets/{session_id}"
-    
-    # Prepare HTML response
-    html = bundle["index_html"]
-    
-    if should_inline:
-        # Inline CSS and JS
-        html = html.replace("</head>", f"<style>\n{bundle['styles_css']}\n</style></head>")
-        html = html.replace("</body>", f"<script>\n{bundle['app_js']}\n</script></body>")
+    # READY bundles never change, so the rendered page is cached per session
+    # until the artifact cleanup removes its bundle
+    html = _rendered_pages.get(session_id)
+    if html is not None and not artifact_store.has_bundle(session_id):
+        del _rendered_pages[session_id]
+        html = None
+    if html is None:
+        # Load bundle from artifact store
+        bundle = artifact_store.load_bundle(session_id)
+        if not bundle:
+            raise HTTPException(status_code=404, detail="Bundle not found")
+        
+        html = _render_page(session_id, bundle)
+        _rendered_pages[session_id] = html
+        if len(_rendered_pages) > RENDERED_PAGE_CACHE_SIZE:
+            _rendered_pages.popitem(last=False)
     else:
-        # Update existing href/src attributes to point to correct asset paths
-        # Update CSS link href - handle any attribute order
-        html = re.sub(
-            r'(<link[^>]*href=["\'])([^"\']*styles\.css)(["\'][^>]*>)',
-            fr'\g<1>{assets_base}/styles.css\g<3>',
-            html,
-            flags=re.IGNORECASE
-        )
-        # Update JS script src
-        html = re.sub(
-            r'(<script[^>]*src=["\'])([^"\']*app\.js)(["\'][^>]*>)',
-            fr'\g<1>{assets_base}/app.js\g<3>',
-            html,
-            flags=re.IGNORECASE
-        )
+        _rendered_pages.move_to_end(session_id)
     
     return Response(
         content=html,
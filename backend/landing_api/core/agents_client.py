@@ -4,9 +4,17 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional
 from landing_api.core.config import settings
+from landing_api.utils.json_utils import loads
 
 logger = logging.getLogger(__name__)
 
+# Backend bundle keys and the file-name key the agents service may use instead
+BUNDLE_KEY_ALIASES = (
+    ("index_html", "index.html"),
+    ("styles_css", "styles.css"),
+    ("app_js", "app.js"),
+)
+
 
 class AgentsServiceClient:
     """Client to communicate with the agents service"""
@@ -68,38 +76,31 @@ class AgentsServiceClient:
             if stop_after:
                 payload["stop_after"] = stop_after
             
-            logger.debug(f"Sending POST to {self.base_url}/build")
+            logger.debug("Sending POST to %s/build", self.base_url)
             response = await client.post(
                 f"{self.base_url}/build",
                 json=payload
             )
             
-            logger.debug(f"Received response: status={response.status_code}")
+            logger.debug("Received response: status=%s", response.status_code)
             
             if response.status_code == 200:
-                result = response.json()
-                logger.debug(f"Response parsed, success={result.get('success')}")
+                # The build response carries the whole bundle; parse the raw
+                # body directly instead of through response.json()
+                result = loads(response.content)
+                logger.debug("Response parsed, success=%s", result.get("success"))
                 
                 # Convert agent service bundle format to backend format
                 if result.get("success") and result.get("bundle"):
                     bundle = result["bundle"]
                     
-                    # Normalize keys
+                    # Normalize keys, preferring the backend key when both exist
                     normalized = {}
-                    if "index_html" in bundle:
-                        normalized["index_html"] = bundle["index_html"]
-                    elif "index.html" in bundle:
-                        normalized["index_html"] = bundle["index.html"]
-                    
-                    if "styles_css" in bundle:
-                        normalized["styles_css"] = bundle["styles_css"]
-                    elif "styles.css" in bundle:
-                        normalized["styles_css"] = bundle["styles.css"]
-                    
-                    if "app_js" in bundle:
-                        normalized["app_js"] = bundle["app_js"]
-                    elif "app.js" in bundle:
-                        normalized["app_js"] = bundle["app.js"]
+                    for key, alias in BUNDLE_KEY_ALIASES:
+                        if key in bundle:
+                            normalized[key] = bundle[key]
+                        elif alias in bundle:
+                            normalized[key] = bundle[alias]
                     
                     result["bundle"] = normalized
                 
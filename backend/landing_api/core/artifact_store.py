@@ -54,12 +54,16 @@ class ArtifactStore:
                         # Write image file
                         target_path = assets_dir / filename
                         target_path.write_bytes(binary_data)
-                        logger.debug(f"Saved image: {target_path}")
+                        logger.debug("Saved image: %s", target_path)
                     except Exception as e:
                         logger.error(f"Error saving image {filename}: {e}")
         
         return str(session_path)
     
+    def has_bundle(self, session_id: str) -> bool:
+        """Check whether a session's bundle is still on disk"""
+        return (self.base_path / session_id).is_dir()
+    
     def load_bundle(self, session_id: str) -> Optional[Dict[str, str]]:
         """Load bundle from disk"""
         session_path = self.base_path / session_id
@@ -75,7 +79,12 @@ class ArtifactStore:
     
     def should_inline(self, bundle: Dict[str, str]) -> bool:
         """Check if bundle should be inlined"""
-        total_size = sum(len(content.encode("utf-8")) for content in bundle.values())
+        # ASCII strings (the common case) have one byte per character, so
+        # only non-ASCII content is encoded to measure its UTF-8 size
+        total_size = sum(
+            len(content) if content.isascii() else len(content.encode("utf-8"))
+            for content in bundle.values()
+        )
         threshold_bytes = settings.inline_threshold_kb * 1024
         return total_size <= threshold_bytes
 
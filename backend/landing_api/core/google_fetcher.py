@@ -1,9 +1,14 @@
 """Google Places API v1 client - HTTP-based implementation"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
 import httpx
 import logging
 import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import Future
 from landing_api.core.config import settings
 from landing_api.models.errors import ApplicationError, ErrorCode
 
@@ -13,6 +18,38 @@ PLACES_BASE = "https://places.googleapis.com/v1"
 MAX_PHOTOS = 4  # How many photo URIs to resolve
 PHOTO_MAX_WIDTH = 1600  # Max width for photo resolution
 
+# Fetched places are reused for repeat builds of the same place_id. Kept short
+# because the resolved photo download URIs are short-lived
+PLACE_CACHE_TTL_SECONDS = 600
+PLACE_CACHE_MAX_ENTRIES = 128
+
+# Place Details fields, joined once at import rather than per request
+PLACE_DETAILS_FIELD_MASK = ",".join([
+    # identity + links
+    "id", "name", "types", "primaryType", "googleMapsUri", "websiteUri",
+    # location
+    "formattedAddress", "addressComponents", "location", "viewport",
+    # contact
+    "internationalPhoneNumber",
+    # hours/status
+    "currentOpeningHours", "currentOpeningHours.openNow",
+    "regularOpeningHours", "regularOpeningHours.weekdayDescriptions",
+    # ratings
+    "rating", "userRatingCount", "priceLevel",
+    # editorial
+    "editorialSummary",
+    # photos (metadata only; URIs come from photo media endpoint)
+    "photos.name", "photos.widthPx", "photos.heightPx", "photos.authorAttributions",
+    # reviews (limited to 5 by API)
+    "reviews.rating", "reviews.text", "reviews.publishTime",
+    "reviews.authorAttribution", "reviews.relativePublishTimeDescription"
+])
+
+
+async def _no_photo_uri() -> None:
+    """Placeholder result for photos without a resource name"""
+    return None
+
 
 class GoogleFetcher:
     """
@@ -30,6 +67,15 @@ class GoogleFetcher:
             logger.warning("GOOGLE_MAPS_API_KEY not set in .env file")
         self.api_key = settings.google_maps_api_key
         self._client: Optional[httpx.AsyncClient] = None
+        # place_id -> (monotonic expiry, response object)
+        self._place_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Builds run on separate threads, so every cache read and write is locked
+        self._place_cache_lock = threading.Lock()
+        # place_id -> fetch in progress. Each build runs on its own event loop
+        # in a worker thread, so the shared result is a thread-safe Future that
+        # other builds' loops await through asyncio.wrap_future
+        self._inflight: Dict[str, "Future[Dict[str, Any]]"] = {}
+        self._inflight_lock = threading.Lock()
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
@@ -68,30 +114,9 @@ class GoogleFetcher:
     
     async def _fetch_place_details(self, place_id: str) -> Dict[str, Any]:
         """Fetch place details from Google Places API v1"""
-        field_mask = ",".join([
-            # identity + links
-            "id", "name", "types", "primaryType", "googleMapsUri", "websiteUri",
-            # location
-            "formattedAddress", "addressComponents", "location", "viewport",
-            # contact
-            "internationalPhoneNumber",
-            # hours/status
-            "currentOpeningHours", "currentOpeningHours.openNow",
-            "regularOpeningHours", "regularOpeningHours.weekdayDescriptions",
-            # ratings
-            "rating", "userRatingCount", "priceLevel",
-            # editorial
-            "editorialSummary",
-            # photos (metadata only; URIs come from photo media endpoint)
-            "photos.name", "photos.widthPx", "photos.heightPx", "photos.authorAttributions",
-            # reviews (limited to 5 by API)
-            "reviews.rating", "reviews.text", "reviews.publishTime",
-            "reviews.authorAttribution", "reviews.relativePublishTimeDescription"
-        ])
-        
         headers = {
             "X-Goog-Api-Key": self.api_key,
-            "X-Goog-FieldMask": field_mask,
+            "X-Goog-FieldMask": PLACE_DETAILS_FIELD_MASK,
         }
         
         url = f"{PLACES_BASE}/places/{place_id}"
@@ -153,11 +178,15 @@ class GoogleFetcher:
                 "author_photo_uri": author_attr.get("photoUri"),
             })
         
-        # Photos: resolve capped number of URIs (each is a separate billable request)
-        raw_photos: List[Dict[str, Any]] = place.get("photos") or []
-        for p in raw_photos[:MAX_PHOTOS]:
+        # Photos: resolve capped number of URIs (each is a separate billable request),
+        # concurrently so the build waits one round-trip instead of one per photo
+        raw_photos: List[Dict[str, Any]] = (place.get("photos") or [])[:MAX_PHOTOS]
+        uris = await asyncio.gather(*(
+            self._resolve_photo_uri(p["name"], PHOTO_MAX_WIDTH) if p.get("name") else _no_photo_uri()
+            for p in raw_photos
+        ))
+        for p, uri in zip(raw_photos, uris):
             name = p.get("name")  # e.g., "places/XXX/photos/YYY"
-            uri = await self._resolve_photo_uri(name, PHOTO_MAX_WIDTH) if name else None
             out["photos"].append({
                 "name": name,
                 "width_px": p.get("widthPx"),
@@ -168,6 +197,27 @@ class GoogleFetcher:
         
         return out
     
+    def _get_cached_place(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Return the shared cached place if still fresh, or None; callers must copy it before mutating"""
+        with self._place_cache_lock:
+            entry = self._place_cache.get(place_id)
+            if entry is None:
+                return None
+            expires_at, place = entry
+            if expires_at < time.monotonic():
+                self._place_cache.pop(place_id, None)
+                return None
+            self._place_cache.move_to_end(place_id)
+            return place
+    
+    def _set_cached_place(self, place_id: str, place: Dict[str, Any]) -> None:
+        """Cache a fetched place, evicting the least recently used entry"""
+        with self._place_cache_lock:
+            self._place_cache[place_id] = (time.monotonic() + PLACE_CACHE_TTL_SECONDS, place)
+            self._place_cache.move_to_end(place_id)
+            if len(self._place_cache) > PLACE_CACHE_MAX_ENTRIES:
+                self._place_cache.popitem(last=False)
+    
     async def fetch_place(self, place_id: str) -> Dict[str, Any]:
         """
         Fetch complete place data from Google Places API v1.
@@ -178,6 +228,38 @@ class GoogleFetcher:
                 code=ErrorCode.CONFIGURATION_ERROR,
                 message="Google Maps API key not configured. Please set GOOGLE_MAPS_API_KEY in .env file."
             )
+        
+        place = self._get_cached_place(place_id)
+        if place is not None:
+            logger.info("[GOOGLE FETCH] Using cached place data for place_id: %s", place_id)
+        else:
+            # Concurrent builds of the same place share a single fetch
+            with self._inflight_lock:
+                shared = self._inflight.get(place_id)
+                is_owner = shared is None
+                if is_owner:
+                    shared = self._inflight[place_id] = Future()
+            
+            if is_owner:
+                try:
+                    place = await self._fetch_place_uncached(place_id)
+                    shared.set_result(place)
+                except BaseException as e:
+                    shared.set_exception(e)
+                    raise
+                finally:
+                    with self._inflight_lock:
+                        self._inflight.pop(place_id, None)
+            else:
+                logger.info("[GOOGLE FETCH] Joining in-flight fetch for place_id: %s", place_id)
+                # Shielded so a cancelled waiter does not cancel the shared fetch
+                place = await asyncio.shield(asyncio.wrap_future(shared))
+        
+        # Callers get their own copy so the shared object is never mutated
+        return copy.deepcopy(place)
+    
+    async def _fetch_place_uncached(self, place_id: str) -> Dict[str, Any]:
+        """Fetch place data from the API and cache the built response object"""
         try:
             logger.info(f"[GOOGLE FETCH] Starting fetch_place for place_id: {place_id}")
             
@@ -188,6 +270,7 @@ class GoogleFetcher:
             # Build response object in the expected format
             logger.info("[GOOGLE FETCH] Building response object...")
             response_obj = await self._build_response_obj(place_data)
+            self._set_cached_place(place_id, response_obj)
             
             logger.info("[GOOGLE FETCH] Returning place data")
             return response_obj
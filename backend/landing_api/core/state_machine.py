@@ -27,6 +27,10 @@ class BuildPhase(str, Enum):
 class BuildState:
     """Manages build state transitions"""
     
+    # One instance per session is kept in the session store; fixed slots drop
+    # the per-instance __dict__
+    __slots__ = ("session_id", "phase", "started_at", "metadata", "event_log", "last_updated")
+    
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.phase = BuildPhase.IDLE
@@ -59,7 +63,7 @@ class BuildState:
         if not self.started_at:
             self.started_at = now
         
-        logger.debug(f"Logged event: {event} (phase: {phase.value})")
+        logger.debug("Logged event: %s (phase: %s)", event, phase.value)
     
     def get_latest_event(self):
         """Get the most recent event"""
@@ -98,43 +98,46 @@ app.include_router(events.router, prefix="/api", tags=["events"])
 
 # Add asset serving route
 from fastapi.responses import FileResponse
-from pathlib import Path
+
+# Media type by file suffix for served assets
+ASSET_MEDIA_TYPES = {
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+# Optimized images never change once written, so they can be cached forever
+IMMUTABLE_ASSET_SUFFIXES = frozenset({".webp", ".jpg", ".jpeg", ".png"})
 
 @app.get("/assets/{session_id}/{file_path:path}")
 async def serve_asset(session_id: str, file_path: str):
     """Serve assets from the artifacts folder"""
-    from landing_api.core.config import settings
+    from landing_api.core.artifact_store import artifact_store
     from fastapi import HTTPException
     
-    asset_path = Path(settings.asset_store) / session_id / file_path
+    # The store's base path is resolved once at startup
+    asset_path = artifact_store.base_path / session_id / file_path
     
     # Security check: ensure path is within session directory
     try:
-        asset_path.resolve().relative_to(Path(settings.asset_store).resolve())
+        asset_path.resolve().relative_to(artifact_store.base_path)
     except ValueError:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    if not asset_path.exists() or not asset_path.is_file():
+    if not asset_path.is_file():
         raise HTTPException(status_code=404, detail="Asset not found")
     
     # Determine media type
-    media_type = "application/octet-stream"
-    if file_path.endswith(".css"):
-        media_type = "text/css"
-    elif file_path.endswith(".js"):
-        media_type = "application/javascript"
-    elif file_path.endswith((".jpg", ".jpeg")):
-        media_type = "image/jpeg"
-    elif file_path.endswith(".png"):
-        media_type = "image/png"
-    elif file_path.endswith(".webp"):
-        media_type = "image/webp"
+    suffix = asset_path.suffix
+    media_type = ASSET_MEDIA_TYPES.get(suffix, "application/octet-stream")
     
     return FileResponse(
         asset_path,
         media_type=media_type,
         headers={
-            "Cache-Control": "public, max-age=31536000, immutable" if file_path.endswith((".webp", ".jpg", ".jpeg", ".png")) else "public, max-age=3600"
+            "Cache-Control": "public, max-age=31536000, immutable" if suffix in IMMUTABLE_ASSET_SUFFIXES else "public, max-age=3600"
         }
     )
 
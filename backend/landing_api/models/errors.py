@@ -18,10 +18,25 @@ class ErrorCode(str, Enum):
     CONFIGURATION_ERROR = "CONFIGURATION_ERROR"
 
 
+# HTTP status per error code; unlisted codes map to 500
+ERROR_HTTP_STATUS = {
+    ErrorCode.INVALID_PLACE_ID: 400,
+    ErrorCode.NOT_FOUND: 404,
+    ErrorCode.GOOGLE_RATE_LIMIT: 429,
+    ErrorCode.GENERATION_FAILED: 500,
+    ErrorCode.BUNDLE_INVALID: 500,
+    ErrorCode.CACHE_ERROR: 500,
+    ErrorCode.ORCHESTRATION_ERROR: 500,
+    ErrorCode.CONFIGURATION_ERROR: 500,
+}
+
+
 class ApplicationError(Exception):
     """Application error"""
     def __init__(self, code: ErrorCode, message: str, retryable: bool = False, hint: Optional[str] = None, session_id: Optional[str] = None):
-        self.error_id = str(uuid.uuid4())
+        # Generated on first access: most errors are caught and re-raised or
+        # logged without ever being reported with their id
+        self._error_id: Optional[str] = None
         self.code = code
         self.message = message
         self.retryable = retryable
@@ -29,6 +44,13 @@ class ApplicationError(Exception):
         self.session_id = session_id
         super().__init__(self.message)
     
+    @property
+    def error_id(self) -> str:
+        """Unique id for this error occurrence"""
+        if self._error_id is None:
+            self._error_id = str(uuid.uuid4())
+        return self._error_id
+    
     def model_dump(self):
         """Return dict representation for API responses"""
         return {
@@ -43,15 +65,5 @@ class ApplicationError(Exception):
     @property
     def http_status(self) -> int:
         """Map error code to HTTP status"""
-        mapping = {
-            ErrorCode.INVALID_PLACE_ID: 400,
-            ErrorCode.NOT_FOUND: 404,
-            ErrorCode.GOOGLE_RATE_LIMIT: 429,
-            ErrorCode.GENERATION_FAILED: 500,
-            ErrorCode.BUNDLE_INVALID: 500,
-            ErrorCode.CACHE_ERROR: 500,
-            ErrorCode.ORCHESTRATION_ERROR: 500,
-            ErrorCode.CONFIGURATION_ERROR: 500,
-        }
-        return mapping.get(self.code, 500)
+        return ERROR_HTTP_STATUS.get(self.code, 500)
 
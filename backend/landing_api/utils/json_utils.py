@@ -0,0 +1,15 @@
+"""JSON helpers with an orjson fast path and stdlib fallback"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to stdlib json
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)